@@ -1,108 +1,210 @@
-from typing import List, Union
+from enum import IntEnum
+from types import MappingProxyType
+from typing import List, Sequence, Union
 
+import functools
+import os
 import time
 import logging
 import check_platform
 from registers import Register
 
-# logging setup
+# logging setup, level can be set via environment variable MCP_LOGLEVEL (e.g. MCP_LOGLEVEL=DEBUG)
 mcp23s17log = logging.getLogger(__name__)
-# mcp23s17log.setLevel(logging.INFO)
-mcp23s17log.setLevel(logging.INFO)
-ch = logging.StreamHandler()
+mcp23s17log.setLevel(os.environ.get('MCP_LOGLEVEL', 'INFO').upper())
 fh = None   # file handler if needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-ch.setFormatter(formatter)
-mcp23s17log.addHandler(ch)
-
-# Check if running on Raspberry Pi for real SPI and GPIO handling
-if check_platform.is_raspberry_pi():
-    from periphery import SPI, GPIO
-    import get_spi_properties
-    RPIPLATFORM = True
-    mcp23s17log.info("Running on a Raspberry Pi, using real SPI & GPIO handling.")
-else:
-    from rpi_sim import GPIO, SPI
-    mcp23s17log.info("Not running on a Raspberry Pi, SPI & GPIO handling will be simulated.")
-    RPIPLATFORM = False
+if not mcp23s17log.handlers and not logging.getLogger().handlers:
+    ch = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ch.setFormatter(formatter)
+    mcp23s17log.addHandler(ch)
+
+# SPI & GPIO backend, selected on first use by _lazy_backend()
+SPI = None
+GPIO = None
+get_spi_properties = None
+spi_message = None
+RPIPLATFORM = None
+_read_spi_cs = None  # device tree CS reader of the selected backend, bound by _lazy_backend()
+
+
+def _lazy_backend() -> bool:
+    """
+    Check if running on Raspberry Pi for real SPI and GPIO handling and import the matching backend.
+    Platform detection and import run once, on first use, the result is cached in RPIPLATFORM.
+    :return: True if running on a Raspberry Pi
+    """
+    global SPI, GPIO, get_spi_properties, spi_message, RPIPLATFORM, _read_spi_cs
+    if RPIPLATFORM is None:
+        if check_platform.IS_RPI:
+            from periphery import SPI, GPIO
+            import get_spi_properties
+            import spi_message
+            _read_spi_cs = get_spi_properties.read_device_tree_spi_cs
+            RPIPLATFORM = True
+            mcp23s17log.info("Running on a Raspberry Pi, using real SPI & GPIO handling.")
+        else:
+            from rpi_sim import GPIO, SPI
+            _read_spi_cs = _sim_device_tree_spi_cs
+            mcp23s17log.info("Not running on a Raspberry Pi, SPI & GPIO handling will be simulated.")
+            RPIPLATFORM = False
+    return RPIPLATFORM
+
+
+def _sim_device_tree_spi_cs() -> dict:
+    """
+    Simulated SPI CS assignments, same layout as get_spi_properties.read_device_tree_spi_cs().
+    """
+    return {'SPI0': [],
+            'SPI1': [{'flags': 0, 'gpio_number': 13, 'phandle': 7}],
+            'SPI2': [{'info': 'No cs-gpios property found. Default CS pins may apply (CE0/CE1).'}]}
+
+
+@functools.lru_cache(maxsize=1)
+def _device_tree_spi_cs() -> dict:
+    """
+    SPI CS assignments from the device tree (simulated values if not on a Raspberry Pi), read once per process.
+    Call _device_tree_spi_cs.cache_clear() and _spi_cs_pin.cache_clear() to reload after a device tree change.
+    """
+    return _read_spi_cs()
+
+
+@functools.lru_cache(maxsize=None)
+def _spi_cs_pin(spi_bus: int):
+    """
+    Resolve the CS pin of a SPI bus from the device tree, cached per bus.
+    :raises RuntimeError: if the bus or its CS pin is not found in the device tree, or reading cs-gpios failed
+    :return: GPIO number of the first CS pin, 'CE0' if the bus uses the default CS pins
+    """
+    spi_properties = _device_tree_spi_cs()
+    if f'SPI{spi_bus}' in spi_properties:
+        cs_list = spi_properties[f'SPI{spi_bus}']
+        if len(cs_list) > 0:
+            # Use the first CS pin found, it is asserted by the SPI controller around each transfer
+            cs_entry = cs_list[0]
+            if 'gpio_number' in cs_entry:
+                cs_pin = cs_entry['gpio_number']
+                mcp23s17log.debug("✅GPIO%s assigned for SPI%d CE", cs_pin, spi_bus)
+                return cs_pin
+            elif 'info' in cs_entry:
+                # no cs-gpios property, the bus uses its default CS pins
+                mcp23s17log.debug("✅CE0 assigned for SPI%d CE", spi_bus)
+                return 'CE0'
+            else:
+                raise RuntimeError(f"❌Reading CS GPIO for SPI bus {spi_bus} failed: {cs_entry.get('error')}")
+        else:
+            raise RuntimeError(f"❌No CS GPIO found for SPI bus {spi_bus}. Check device tree configuration.")
+    else:
+        raise RuntimeError(f"❌SPI bus {spi_bus} not found in device tree.")
+
+
+# bit names per register, leftmost is MSB (bit 7)
+_IO_BITS = tuple(f'IO{bit}' for bit in range(7, -1, -1))
+_IP_BITS = tuple(f'IP{bit}' for bit in range(7, -1, -1))
+_GPINT_BITS = tuple(f'GPINT{bit}' for bit in range(7, -1, -1))
+_DEF_BITS = tuple(f'DEF{bit}' for bit in range(7, -1, -1))
+_IOC_BITS = tuple(f'IOC{bit}' for bit in range(7, -1, -1))
+_PU_BITS = tuple(f'PU{bit}' for bit in range(7, -1, -1))
+_INT_BITS = tuple(f'INT{bit}' for bit in range(7, -1, -1))
+_ICP_BITS = tuple(f'ICP{bit}' for bit in range(7, -1, -1))
+_GP_BITS = tuple(f'GP{bit}' for bit in range(7, -1, -1))
+_OL_BITS = tuple(f'OL{bit}' for bit in range(7, -1, -1))
+_IOCON_BITS = ('BANK', 'MIRROR', 'SEQOP', 'DISSLW', 'HAEN', 'ODR', 'INTPOL', 'UNUSED')
+
+# MCP23S17 registers with their addresses and bit maps
+# address is for IOCON.BANK=0 (default), alt_address is for IOCON.BANK=1
+_REGISTERS = MappingProxyType(dict(
+    IODIRA=Register(0x00, _IO_BITS, alt_address=0x00, use_alt_address=False),
+    IODIRB=Register(0x01, _IO_BITS, alt_address=0x10, use_alt_address=False),
+    IPOLA=Register(0x02, _IP_BITS, alt_address=0x01, use_alt_address=False),
+    IPOLB=Register(0x03, _IP_BITS, alt_address=0x11, use_alt_address=False),
+    GPINTENA=Register(0x04, _GPINT_BITS, alt_address=0x02, use_alt_address=False),
+    GPINTENB=Register(0x05, _GPINT_BITS, alt_address=0x12, use_alt_address=False),
+    DEFVALA=Register(0x06, _DEF_BITS, alt_address=0x03, use_alt_address=False),
+    DEFVALB=Register(0x07, _DEF_BITS, alt_address=0x13, use_alt_address=False),
+    INTCONA=Register(0x08, _IOC_BITS, alt_address=0x04, use_alt_address=False),
+    INTCONB=Register(0x09, _IOC_BITS, alt_address=0x14, use_alt_address=False),
+    IOCON=Register(0x0A, _IOCON_BITS, alt_address=0x05, use_alt_address=False),
+    IOCON1=Register(0x0B, _IOCON_BITS, alt_address=0x15, use_alt_address=False),
+    GPPUA=Register(0x0C, _PU_BITS, alt_address=0x06, use_alt_address=False),
+    GPPUB=Register(0x0D, _PU_BITS, alt_address=0x16, use_alt_address=False),
+    INTFA=Register(0x0E, _INT_BITS, alt_address=0x07, use_alt_address=False),
+    INTFB=Register(0x0F, _INT_BITS, alt_address=0x17, use_alt_address=False),
+    INTCAPA=Register(0x10, _ICP_BITS, alt_address=0x08, use_alt_address=False),
+    INTCAPB=Register(0x11, _ICP_BITS, alt_address=0x18, use_alt_address=False),
+    GPIOA=Register(0x12, _GP_BITS, alt_address=0x09, use_alt_address=False),
+    GPIOB=Register(0x13, _GP_BITS, alt_address=0x19, use_alt_address=False),
+    OLATA=Register(0x14, _OL_BITS, alt_address=0x0A, use_alt_address=False),
+    OLATB=Register(0x15, _OL_BITS, alt_address=0x1A, use_alt_address=False),
+))
+
+# register addresses resolved per BANK setting: _REG_ADDR[bank][register name]
+_REG_ADDR = (MappingProxyType({name: reg.address for name, reg in _REGISTERS.items()}),
+             MappingProxyType({name: reg.alt_address for name, reg in _REGISTERS.items()}))
+
+# compact register ids, value is the BANK=0 address (IODIRA=0x00 .. OLATB=0x15), e.g. Reg.GPIOA
+Reg = IntEnum('Reg', [(name, reg.address) for name, reg in _REGISTERS.items()])
+
+# register addresses per BANK setting as byte tables indexed by Reg: _REG_TABLE[bank][Reg.GPIOA]
+_REG_TABLE = (bytes(reg.address for reg in sorted(_REGISTERS.values(), key=lambda r: r.address)),
+              bytes(reg.alt_address for reg in sorted(_REGISTERS.values(), key=lambda r: r.address)))
+
+# registers of the bulk I/O path, transferred with SPI_SPEED_FAST (if set)
+_FAST_REGISTERS = frozenset({'GPIOA', 'GPIOB', 'OLATA', 'OLATB', 'IODIRA', 'IODIRB'})
+# their addresses per BANK setting: _FAST_ADDR[bank]
+_FAST_ADDR = tuple(frozenset(_REG_ADDR[bank][name] for name in _FAST_REGISTERS) for bank in (0, 1))
 
 
 class MCP23S17:
     """MCP23S17 16-Bit I/O Expander with SPI Interface"""
 
-    # MCP23S17 registers with their addresses and bit maps
-    # address is for IOCON.BANK=0 (default), alt_address is for IOCON.BANK=1
-    REGISTERS = dict(
-        IODIRA=Register(0x00, ['IO7', 'IO6', 'IO5', 'IO4', 'IO3', 'IO2', 'IO1', 'IO0'],
-                        alt_address=0x00, use_alt_address=False),
-        IODIRB=Register(0x01, ['IO7', 'IO6', 'IO5', 'IO4', 'IO3', 'IO2', 'IO1', 'IO0'],
-                        alt_address=0x10, use_alt_address=False),
-        IPOLA=Register(0x02, ['IP7', 'IP6', 'IP5', 'IP4', 'IP3', 'IP2', 'IP1', 'IP0'],
-                       alt_address=0x01, use_alt_address=False),
-        IPOLB=Register(0x03, ['IP7', 'IP6', 'IP5', 'IP4', 'IP3', 'IP2', 'IP1', 'IP0'],
-                       alt_address=0x11, use_alt_address=False),
-        GPINTENA=Register(0x04, ['GPINT7', 'GPINT6', 'GPINT5', 'GPINT4', 'GPINT3', 'GPINT2', 'GPINT1', 'GPINT0'],
-                          alt_address=0x02, use_alt_address=False),
-        GPINTENB=Register(0x05, ['GPINT7', 'GPINT6', 'GPINT5', 'GPINT4', 'GPINT3', 'GPINT2', 'GPINT1', 'GPINT0'],
-                          alt_address=0x12, use_alt_address=False),
-        DEFVALA=Register(0x06, ['DEF7', 'DEF6', 'DEF5', 'DEF4', 'DEF3', 'DEF2', 'DEF1', 'DEF0'],
-                         alt_address=0x03, use_alt_address=False),
-        DEFVALB=Register(0x07, ['DEF7', 'DEF6', 'DEF5', 'DEF4', 'DEF3', 'DEF2', 'DEF1', 'DEF0'],
-                         alt_address=0x13, use_alt_address=False),
-        INTCONA=Register(0x08, ['IOC7', 'IOC6', 'IOC5', 'IOC4', 'IOC3', 'IOC2', 'IOC1', 'IOC0'],
-                         alt_address=0x04, use_alt_address=False),
-        INTCONB=Register(0x09, ['IOC7', 'IOC6', 'IOC5', 'IOC4', 'IOC3', 'IOC2', 'IOC1', 'IOC0'],
-                         alt_address=0x14, use_alt_address=False),
-        IOCON=Register(0x0A, ['BANK', 'MIRROR', 'SEQOP', 'DISSLW', 'HAEN', 'ODR', 'INTPOL', 'UNUSED'],
-                       alt_address=0x05, use_alt_address=False),
-        IOCON1=Register(0x0B, ['BANK', 'MIRROR', 'SEQOP', 'DISSLW', 'HAEN', 'ODR', 'INTPOL', 'UNUSED'],
-                        alt_address=0x15, use_alt_address=False),
-        GPPUA=Register(0x0C, ['PU7', 'PU6', 'PU5', 'PU4', 'PU3', 'PU2', 'PU1', 'PU0'],
-                       alt_address=0x06, use_alt_address=False),
-        GPPUB=Register(0x0D, ['PU7', 'PU6', 'PU5', 'PU4', 'PU3', 'PU2', 'PU1', 'PU0'],
-                       alt_address=0x16, use_alt_address=False),
-        INTFA=Register(0x0E, ['INT7', 'INT6', 'INT5', 'INT4', 'INT3', 'INT2', 'INT1', 'INT0'],
-                       alt_address=0x07, use_alt_address=False),
-        INTFB=Register(0x0F, ['INT7', 'INT6', 'INT5', 'INT4', 'INT3', 'INT2', 'INT1', 'INT0'],
-                       alt_address=0x17, use_alt_address=False),
-        INTCAPA=Register(0x10, ['ICP7', 'ICP6', 'ICP5', 'ICP4', 'ICP3', 'ICP2', 'ICP1', 'ICP0'],
-                         alt_address=0x08, use_alt_address=False),
-        INTCAPB=Register(0x11, ['ICP7', 'ICP6', 'ICP5', 'ICP4', 'ICP3', 'ICP2', 'ICP1', 'ICP0'],
-                         alt_address=0x18, use_alt_address=False),
-        GPIOA=Register(0x12, ['GP7', 'GP6', 'GP5', 'GP4', 'GP3', 'GP2', 'GP1', 'GP0'],
-                       alt_address=0x09, use_alt_address=False),
-        GPIOB=Register(0x13, ['GP7', 'GP6', 'GP5', 'GP4', 'GP3', 'GP2', 'GP1', 'GP0'],
-                       alt_address=0x19, use_alt_address=False),
-        OLATA=Register(0x14, ['OL7', 'OL6', 'OL5', 'OL4', 'OL3', 'OL2', 'OL1', 'OL0'],
-                       alt_address=0x0A, use_alt_address=False),
-        OLATB=Register(0x15, ['OL7', 'OL6', 'OL5', 'OL4', 'OL3', 'OL2', 'OL1', 'OL0'],
-                       alt_address=0x1A, use_alt_address=False),
-    )
+    # fixed set of instance attributes, no per-instance __dict__
+    __slots__ = ('_available_devices', 'mcp_settings', '_opened_device', '_mode', '_open_key', 'bank',
+                 '_txbuf', '_rxbuf', 'spi', '_xfer', '_fast_hz', '_gpios', '_reset_gpio', '_inta_gpio', '_intb_gpio')
+
+    # MCP23S17 registers with their addresses and bit maps, see _REGISTERS
+    REGISTERS = _REGISTERS
+    REGISTER_ADDR = _REG_ADDR  # REGISTER_ADDR[bank][register name] -> register address, resolved once at import
+    Reg = Reg  # register ids, accepted everywhere a register name is accepted
 
     # MCP_DEFAULTS contains default settings for GPIO pins and SPI configuration
     #    GPIOS are defined as (pin_number, direction, [initial val]) tuples and are initialized in __init__()
     #    access them via self.mcp_pins[<pinname>], pinname is derived from key by removing 'GPIO_' and lowercasing
     #    e.g. self.mcp_pins['reset'] from self.mcp_settings['GPIO_RESET']
     #    SPI settings are used in init_spi() to initialize the SPI interface
+    #    MCP23S17 CS is driven by the SPI controller (device tree CS pin), e.g. dtoverlay=spi1-1cs,cs0_pin=13
     DEFAULTS = {
         'GPIO_RESET': (27, "out", True),  # GPIO pin for MCP23S17 RESET, in/out from raspberry perspective
         'GPIO_INTA': (23, "in"),    # GPIO pin for MCP23S17 INTA, in/out from raspberry perspective
         'GPIO_INTB': (24, "in"),    # GPIO pin for MCP23S17 INTB, in/out from raspberry perspective
-        'GPIO_CE': (13, "out", True),  # GPIO pin for MCP23S17 CE, driven man., must not conflict with device tree
         'SPI_MODE': 0b00,   # SPI mode (Clock Polarity 0, Clock Phase 0)
         'SPI_BUS': 1,       # SPI bus number (usually 0 or 1 on Raspberry Pi)
-        'SPI_SPEED': 1000000,  # 1 MHz
+        'SPI_SPEED': 10_000_000,  # 10 MHz, MCP23S17 datasheet maximum for VDD 2.7..5.5V (5 MHz below 2.7V)
+        'SPI_SPEED_FAST': None,   # SPI speed for FAST_REGISTERS transfers (e.g. with lower SPI_SPEED), None = SPI_SPEED
         'BANK': 0,   # 16 bit mode (=IOCON.BANK=0), 8 bit mode (=IOCON.BANK=1)
-        'SEQOP': 0  # Sequential operation mode (0=enabled, 1=disabled)
+        'SEQOP': 0,  # Sequential operation mode (0=enabled, 1=disabled)
+        'DEBUG_GPIO': False  # read back output GPIOs after each write in reset() (costs one syscall per edge)
     }
 
+    # registers of the bulk I/O path, all transfers to them use SPI_SPEED_FAST (if set) as per-transfer speed
+    FAST_REGISTERS = _FAST_REGISTERS
+
     READ = 1
     WRITE = 0
     OPCODE = 0b01000000  # Fixed opcode for MCP23S17
     DEVICE_ADDRESS_MASK = 0b00000111  # Mask for device address bits A2, A1, A0
-    DEVICE_ADDRESS = lambda addr: (addr & MCP23S17.DEVICE_ADDRESS_MASK) << 1  # Shifted device address
-    CONTROLBYTE = lambda addr, rw: (MCP23S17.OPCODE | MCP23S17.DEVICE_ADDRESS(addr) |
-                                    (0b1 if rw == MCP23S17.READ else 0b0))
+
+    @staticmethod
+    def DEVICE_ADDRESS(addr: int) -> int:
+        # Shifted device address
+        return (addr & MCP23S17.DEVICE_ADDRESS_MASK) << 1
+
+    @staticmethod
+    def CONTROLBYTE(addr: int, rw: int) -> int:
+        # Control byte: opcode, device address and R/W bit
+        return MCP23S17.OPCODE | MCP23S17.DEVICE_ADDRESS(addr) | (rw & 0b1)  # READ=1, WRITE=0 is the R/W bit
+
+    # CONTROL_BYTES: precomputed CONTROLBYTE() table, indexed by [device address * 2 + mode], set below the class
 
     def __init__(self, **kwargs):
         """
@@ -112,29 +214,43 @@ class MCP23S17:
         1. GPIO_RESET: (pin_number, direction) tuple for RESET pin
         2. GPIO_INTA: (pin_number, direction) tuple for INTA pin
         3. GPIO_INTB: (pin_number, direction) tuple for INTB pin
-        4. SPI_CE: GPIO pin number for Chip Enable (CE) pin, must not conflict with device tree CS pin
-        5. SPI_MODE: SPI mode (0, 1, 2, or 3)
-        6. SPI_BUS: SPI bus number (0 or 1)
-        7. SPI_SPEED: SPI clock speed in Hz
-        8. REGISTERMODE: 16 for IOCON.BANK=0 (default), 8 for IOCON.BANK=1
+        4. SPI_MODE: SPI mode (0, 1, 2, or 3)
+        5. SPI_BUS: SPI bus number (0 or 1), CS is the device tree CS pin of this bus
+        6. SPI_SPEED: SPI clock speed in Hz, SPI_SPEED_FAST: SPI clock speed in Hz for FAST_REGISTERS transfers
+        7. REGISTERMODE: 16 for IOCON.BANK=0 (default), 8 for IOCON.BANK=1
+        8. DEBUG_GPIO: True to verify the RESET pin level after each edge in reset()
         9. Additional GPIOs can be added as needed
-        10. Example: MCP23S17(GPIO_RESET=(27, "out"), SPI_BUS=0, SPI_CE=25)
+        10. Example: MCP23S17(GPIO_RESET=(27, "out"), SPI_BUS=0)
         """
-        # copy defaults to mcp_settings if not defined in kwargs
+        _lazy_backend()  # select real or simulated SPI & GPIO handling
         self._available_devices = []  # list of detected device addresses
-        self.mcp_settings = dict()
         self._opened_device = -1  # currently opened device address, -1 = none
         self._mode = None  # current mode (READ or WRITE) of opened device
+        self._open_key = None  # (device, register, mode, bank) of the last validated open_device() call
         self.bank = [0] * 8  # current BANK setting for each possible device address (0-7), default (after reset) is 0
-
-        for key, value in self.DEFAULTS.items():
-            self.mcp_settings[key] = kwargs.get(key, value)
-            mcp23s17log.debug(f"MCP setting {key} = {self.mcp_settings[key]}")
-
-        self.spi = self.init_spi()  # checks device tree for SPI bus and CS pin
+        # preallocated SPI TX buffers (control byte + register address + up to 32 data bytes) for writes and reads
+        self._txbuf = bytearray(34)
+        self._rxbuf = bytearray(34)
+
+        # copy defaults to mcp_settings if not defined in kwargs (only keys of DEFAULTS, case-sensitive)
+        self.mcp_settings = {**self.DEFAULTS, **{k: v for k, v in kwargs.items() if k in self.DEFAULTS}}
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("MCP settings: %s", self.mcp_settings)
+        # per-transfer speed for FAST_REGISTERS, 0 = no override (SPI_SPEED_FAST not set or equal to SPI_SPEED)
+        fast_hz = self.mcp_settings['SPI_SPEED_FAST']
+        self._fast_hz = fast_hz if fast_hz and fast_hz != self.mcp_settings['SPI_SPEED'] else 0
+
+        self.spi = None
+        self._xfer = None  # bound self.spi.transfer, set after init_spi()
         self._gpios = dict()  # will hold periphery.GPIO instances for MCP control
+        self._reset_gpio = None  # direct references to the control pins, set by setup_gpios()
+        self._inta_gpio = None
+        self._intb_gpio = None
         self.setup_gpios()   # fills the dict self.gpios with periphery.GPIO instances for MCP control
-        self.reset()         # reset all connected MCP23S17 devices
+        self.verify_gpios()  # one-time write/read check of the output pins
+        self.reset()         # reset all connected MCP23S17 devices, devices stabilize during SPI setup
+        self.spi = self.init_spi()  # checks device tree for SPI bus and CS pin
+        self._xfer = self.spi.transfer  # bound once, saves the attribute lookups per transaction
         # initial list of devices contains all possible addresses, will be filtered in detect_devices()
         self.detect_devices()  # writes self._available_devices with detected device addresses
 
@@ -143,25 +259,28 @@ class MCP23S17:
         try:
             for pinname, gpio in self._gpios.items():
                 gpio.close()
-                mcp23s17log.debug(f"Closed GPIO for {pinname}")
+                mcp23s17log.debug("Closed GPIO for %s", pinname)
             if self.spi:
                 self.spi.close()
                 mcp23s17log.debug("Closed SPI interface")
         except Exception as e:
-            mcp23s17log.error(f"Error during MCP23S17 cleanup: {e}")
+            mcp23s17log.error("Error during MCP23S17 cleanup: %s", e)
 
     class writeContext:
-        def __init__(self, device_obj, device_addr, register):
+        def __init__(self, device_obj, device_addr, register, speed=None):
             self.device_obj = device_obj     # object of class MCP23S17
             self.device_addr = device_addr   # device address (0-7)
             self.register = register         # register name (str) or address (int)
+            self.speed_hz = speed or 0       # per-transfer SPI speed (Hz) for this context, 0 = default speed
+            self._transact = device_obj._write_transact  # bound inner transaction, validated by open_device()
             self.available = device_addr in device_obj.available_devices
             self.bank = device_obj.bank[device_addr]  # current BANK setting for this device
 
             if self.available:
-                mcp23s17log.debug(f"writeContext created for device {device_addr}, register {register}")
+                if mcp23s17log.isEnabledFor(logging.DEBUG):
+                    mcp23s17log.debug("writeContext created for device %d, register %s", device_addr, register)
             else:
-                mcp23s17log.warning(f"writeContext created for unavailable device {device_addr}, no access possible")
+                mcp23s17log.warning("writeContext created for unavailable device %d, no access possible", device_addr)
 
         def __enter__(self):
             # open_device(self, device: int, register: Union[str, int], mode: int) -> None:
@@ -172,39 +291,44 @@ class MCP23S17:
         def __exit__(self, exc_type, exc_val, exc_tb):
             self.device_obj.close_device()
 
-        def __call__(self, d: List[int]) -> List[int]:
+        def __call__(self, d: Union[bytes, bytearray, Sequence[int]]) -> bytes:
             return self.transfer(d)
 
-        def transfer(self, d: List[int]) -> List[int]:
+        def transfer(self, d: Union[bytes, bytearray, Sequence[int]]) -> bytes:
+            # the transaction carries its own control byte (WRITE) and register address, no mode check needed
             if not self.available:
-                return []
-            if self.device_obj.mode != MCP23S17.WRITE:
-                raise RuntimeError("Device not opened in WRITE mode.")
-            return self.device_obj.spi.transfer(d)
+                return b''
+            return self._transact(self.device_addr, self.register, d, self.speed_hz)
 
-    def write(self, device_addr, register):
+    def write(self, device_addr, register, speed=None):
         """
         Context manager to automatically open and close communication with a specific MCP23S17 device for writing.
+        Each call is one SPI transaction (control byte, register address and payload in one transfer) starting
+        at the given register, consecutive registers are written if IOCON.SEQOP=0.
+        speed (Hz) overrides SPI_SPEED for the transfers of the context (e.g. lower speed for long wiring), it is
+        sent as per-transfer speed, no extra ioctl. Without speed, FAST_REGISTERS use SPI_SPEED_FAST if set.
         Usage:
-            with mcp.write(device=0, register='IODIRA', bank=0) as wdev:
+            with mcp.write(device_addr=0, register='IODIRA') as wdev:
                 wdev([0xFF])  # Example write operation
         """
-        bank = self.bank[device_addr]  # current BANK setting for this device
-        reg_addr = MCP23S17.REGISTERS[register].address if bank == 0 else MCP23S17.REGISTERS[register].alt_address
-        return MCP23S17.writeContext(self, device_addr, reg_addr)
+        reg_addr = self._register_address(register, self.bank[device_addr])  # resolved with current BANK setting
+        return MCP23S17.writeContext(self, device_addr, reg_addr, speed)
 
     class readContext:
-        def __init__(self, device_obj, device_addr, register):
+        def __init__(self, device_obj, device_addr, register, speed=None):
             self.device_obj = device_obj     # object of class MCP23S17
             self.device_addr = device_addr   # device address (0-7)
             self.register = register         # register name (str) or address (int)
+            self.speed_hz = speed or 0       # per-transfer SPI speed (Hz) for this context, 0 = default speed
+            self._transact = device_obj._read_transact  # bound inner transaction, validated by open_device()
             self.available = device_addr in device_obj.available_devices
             self.bank = device_obj.bank[device_addr]  # current BANK setting for this device
 
             if self.available:
-                mcp23s17log.debug(f"readContext created for device {device_addr}, register {register}")
+                if mcp23s17log.isEnabledFor(logging.DEBUG):
+                    mcp23s17log.debug("readContext created for device %d, register %s", device_addr, register)
             else:
-                mcp23s17log.warning(f"readContext created for unavailable device {device_addr}, no access possible")
+                mcp23s17log.warning("readContext created for unavailable device %d, no access possible", device_addr)
 
         def __enter__(self):
             if self.available:
@@ -214,27 +338,28 @@ class MCP23S17:
         def __exit__(self, exc_type, exc_val, exc_tb):
             self.device_obj.close_device()
 
-        def __call__(self, nbytes: int) -> List[int]:
+        def __call__(self, nbytes: int) -> bytes:
             return self.transfer(nbytes)
 
-        def transfer(self, nbytes: int) -> List[int]:
+        def transfer(self, nbytes: int) -> bytes:
+            # the transaction carries its own control byte (READ) and register address, no mode check needed
             if not self.available:
-                return []
-            if self.device_obj.mode != MCP23S17.READ:
-                raise RuntimeError("Device not opened in READ mode.")
-            dummy = [0x00] * nbytes  # send dummy bytes to read data
-            return self.device_obj.spi.transfer(dummy)
+                return b''
+            return self._transact(self.device_addr, self.register, nbytes, self.speed_hz)
 
-    def read(self, device_addr, register):
+    def read(self, device_addr, register, speed=None):
         """
-        Context manager to automatically open and close communication with a specific MCP23S17 device for writing.
+        Context manager to automatically open and close communication with a specific MCP23S17 device for reading.
+        Each call is one SPI transaction (control byte, register address and dummy bytes in one transfer) starting
+        at the given register, consecutive registers are read if IOCON.SEQOP=0.
+        speed (Hz) overrides SPI_SPEED for the transfers of the context (e.g. lower speed for long wiring), it is
+        sent as per-transfer speed, no extra ioctl. Without speed, FAST_REGISTERS use SPI_SPEED_FAST if set.
         Usage:
-            with mcp.write(device=0, register='IODIRA', bank=0) as dev:
-                dev._write_device([0xFF])  # Example write operation
+            with mcp.read(device_addr=0, register='IODIRA') as rdev:
+                data = rdev(2)  # Example read operation, IODIRA and IODIRB
         """
-        bank = self.bank[device_addr]  # current BANK setting for this device
-        reg_addr = MCP23S17.REGISTERS[register].address if bank == 0 else MCP23S17.REGISTERS[register].alt_address
-        return self.readContext(self, device_addr, reg_addr)
+        reg_addr = self._register_address(register, self.bank[device_addr])  # resolved with current BANK setting
+        return self.readContext(self, device_addr, reg_addr, speed)
 
     @property
     def available_devices(self):
@@ -283,38 +408,22 @@ class MCP23S17:
     def init_spi(self):
         """
         Initialize SPI interface for MCP23S17 communication
+        The MCP23S17 CS pin is wired to the chip select of spidev<SPI_BUS>.0, the kernel asserts it within each
+        transfer ioctl, no GPIO is toggled from Python. Sample /boot/firmware/config.txt for the default SPI_BUS=1:
+            dtoverlay=spi1-1cs,cs0_pin=13    # spidev1.0, CS on GPIO13
+        or for SPI_BUS=0 (CE0 = GPIO8):
+            dtparam=spi=on
         """
-        if RPIPLATFORM:
-            spi_properties = get_spi_properties.read_device_tree_spi_cs()
-        else:
-            spi_properties = {'SPI0': [],
-                              'SPI1': [{'flags': 0, 'gpio_number': 13, 'phandle': 7}],
-                              'SPI2': [{'info': 'No cs-gpios property found. Default CS pins may apply (CE0/CE1).'}]}
-
         spi_bus = self.mcp_settings['SPI_BUS']
-
-        if f'SPI{spi_bus}' in spi_properties:
-            cs_list = spi_properties[f'SPI{spi_bus}']
-            if len(cs_list) > 0:
-                cs_pin = cs_list[0]['gpio_number']  # Use the first CS pin found
-                if cs_pin == self.mcp_settings['GPIO_CE']:
-                    raise RuntimeError(f"CS GPIO {cs_pin} from device tree must not conflict with CE GPIO "
-                                       f"{self.mcp_settings['SPI_CE']}. Check device tree configuration."
-                                       f"GPIO{cs_pin} needs to be operated programatically as CE pin.")
-                else:
-                    mcp23s17log.debug(f"✅GPIO{cs_pin} assigned for SPI{spi_bus} CE")
-            else:
-                raise RuntimeError(f"❌No CS GPIO found for SPI bus {spi_bus}. Check device tree configuration.")
-        else:
-            raise RuntimeError(f"❌SPI bus {spi_bus} not found in device tree.")
+        cs_pin = _spi_cs_pin(spi_bus)  # device tree lookup, cached per bus
 
         spi = SPI(devpath=f'/dev/spidev{spi_bus}.0',
                   max_speed=self.mcp_settings['SPI_SPEED'],
                   mode=self.mcp_settings['SPI_MODE'],
                   bit_order='msb',
                   bits_per_word=8)
-        mcp23s17log.debug(f"Initialized SPI bus {spi_bus} with CE GPIO {cs_pin}, "
-                          f"speed {self.mcp_settings['SPI_SPEED']} Hz, mode {self.mcp_settings['SPI_MODE']}")
+        mcp23s17log.debug("Initialized SPI bus %d with CS GPIO %s, speed %d Hz, mode %d",
+                          spi_bus, cs_pin, self.mcp_settings['SPI_SPEED'], self.mcp_settings['SPI_MODE'])
         return spi
 
     def setup_gpios(self):
@@ -325,39 +434,75 @@ class MCP23S17:
             if not key.startswith('GPIO_'):
                 continue
             pin_nr, direction = value[0:2]
-            gpio = GPIO("/dev/gpiochip0", pin_nr, direction)
             if direction == "out":
                 if len(value) < 3:
                     initial_value = False
                 else:
                     initial_value = value[2]
 
-                gpio.write(initial_value)
-                mcp23s17log.debug(f"Setup GPIO {pin_nr} as {direction} for {key} ({initial_value})")
+                # "high"/"low" drive the initial value with the line request itself, no separate write
+                gpio = GPIO("/dev/gpiochip0", pin_nr, "high" if initial_value else "low")
+                mcp23s17log.debug("Setup GPIO %d as %s for %s (%s)", pin_nr, direction, key, initial_value)
+            elif key in ('GPIO_INTA', 'GPIO_INTB'):
+                # INT outputs are active low (IOCON.INTPOL=0), falling edges are delivered as kernel events,
+                # see wait_interrupt()
+                gpio = GPIO("/dev/gpiochip0", pin_nr, direction, edge="falling")
+                mcp23s17log.debug("Setup GPIO %d as %s (falling edge events) for %s", pin_nr, direction, key)
             else:
-                mcp23s17log.debug(f"Setup GPIO {pin_nr} as {direction} for {key}")
-
-            self._gpios[key.removeprefix('GPIO_').lower()] = gpio
+                gpio = GPIO("/dev/gpiochip0", pin_nr, direction)
+                mcp23s17log.debug("Setup GPIO %d as %s for %s", pin_nr, direction, key)
+
+            pinname = key.removeprefix('GPIO_').lower()
+            self._gpios[pinname] = gpio
+            if pinname == 'reset':
+                self._reset_gpio = gpio
+            elif pinname == 'inta':
+                self._inta_gpio = gpio
+            elif pinname == 'intb':
+                self._intb_gpio = gpio
+
+    def verify_gpios(self) -> bool:
+        """
+        Self-test of the GPIO output pins: write the configured initial value and read it back once.
+        Output pins are not read back during normal operation, a mismatch only logs a warning.
+        :return: True if all output pins read back the written value
+        """
+        ok = True
+        for key, value in self.mcp_settings.items():
+            if not key.startswith('GPIO_') or value[1] != "out":
+                continue
+            initial_value = value[2] if len(value) >= 3 else False
+            gpio = self._gpios[key.removeprefix('GPIO_').lower()]
+            gpio.write(initial_value)
+            if bool(gpio.read()) != bool(initial_value):
+                mcp23s17log.warning("GPIO %d for %s does not read back the written value %s",
+                                    value[0], key, initial_value)
+                ok = False
+        return ok
 
     def reset(self):
         """
         Reset all connected MCP23S17 devices by toggling their RESET pins.
         Assumes that all RESET pins are connected to a common GPIO pin.
+        The datasheet minimum RESET low pulse width is 1us, 10us low (the actual sleep is longer, scheduler
+        granularity) and 1ms settling leave ample margin.
         """
-        if self._gpios.get('reset', None) is None:
+        if self._reset_gpio is None:
             raise RuntimeError("RESET pin not configured in MCP settings.")
 
-        self._gpios['reset'].write(False)  # Set RESET low
-        time.sleep(0.1)  # Hold RESET low for 100ms
-        if self._gpios['reset'].read():
+        debug_gpio = self.mcp_settings['DEBUG_GPIO']
+        self._reset_gpio.write(False)  # Set RESET low
+        time.sleep(1e-5)  # Hold RESET low for at least 10us
+        if debug_gpio and self._reset_gpio.read():
             raise RuntimeError("Failed to set RESET pin low.")
 
-        self._gpios['reset'].write(True)   # Set RESET high
-        time.sleep(0.1)  # Wait for devices to stabilize
-        if not self._gpios['reset'].read():
+        self._reset_gpio.write(True)   # Set RESET high
+        time.sleep(0.001)  # Wait for devices to stabilize
+        if debug_gpio and not self._reset_gpio.read():
             raise RuntimeError("Failed to set RESET pin high.")
 
         self.bank = [0] * 8  # reset bank settings for all possible devices
+        self._open_key = None
         mcp23s17log.info("MCP23S17 devices reset successfully.")
 
     def detect_devices(self):
@@ -367,52 +512,41 @@ class MCP23S17:
         This function sets the IOCON.HAEN bit using device address 0. All devices attached to the bus
         will accept this, allowing subsequent communication using their unique addresses.
         reading the IOCON register back to verify communication from all device addresses (0-7). A response
-        with the HAEN bit set indicates a present device.
+        with the HAEN bit set indicates a present device. The IOCON write and the 8 IOCON reads are sent as one
+        SPI message of 9 frames with CS toggled between the frames (see _xfer_frames()), the write takes effect
+        at the end of its frame.
         """
 
         if len(self._available_devices):
-            mcp23s17log.info(f"Redetecting devices, previous detected addresses: {self._available_devices}")
+            mcp23s17log.info("Redetecting devices, previous detected addresses: %s", self._available_devices)
             return
-        else:
-            self._available_devices = list(range(0, 8))  # start with all possible addresses
 
-        self.open_device(device_addr=0, register='IOCON', mode=self.WRITE)  # HAEN is still 0 - all devices accept this
         haen_bit = MCP23S17.REGISTERS['IOCON']('HAEN')  # value with HAEN=1
-        self.spi.transfer([haen_bit])  # Set IOCON.HAEN=1, other bits unchanged
-        self.close_device()
-        # HEAN is now set at all devices, we can address them individually
-        detected_devices = []
-        dummybyte = [0b00000000]
-        for addr in range(0, 8):
-            # send control byte and register address
-            self.open_device(device_addr=addr, register='IOCON', mode=self.READ)
-            r_data = self.spi.transfer(dummybyte)  # Send dummy bytes to read data
-            self.close_device()
-            if r_data[0] & haen_bit:  # Check if HAEN bit is set
-                detected_devices.append(addr)
-                mcp23s17log.info(f"Detected MCP23S17 device at address {addr}")
-            else:
-                mcp23s17log.debug(f"No MCP23S17 device at address {addr} (no HAEN bit set)")
+        # HAEN is still 0 - all devices accept this. Write IOCON = HAEN with device address 0, all other IOCON bits,
+        # SEQOP included (sequential mode for burst and 16 bit access), are written as 0
+        frames = [bytes((MCP23S17.CONTROL_BYTES[MCP23S17.WRITE], _REG_ADDR[self.bank[0]]['IOCON'], haen_bit))]
+        # HEAN is then set at all devices, we can address them individually
+        # one frame per address: control byte, IOCON address, dummy byte
+        frames += [bytes((MCP23S17.CONTROL_BYTES[addr * 2 + MCP23S17.READ], _REG_ADDR[self.bank[addr]]['IOCON'], 0x00))
+                   for addr in range(0, 8)]
+        responses = self._xfer_frames(frames)[1:]
+        # a set HAEN bit indicates a present device, logged once for all addresses
+        detected_devices = [addr for addr, r_data in enumerate(responses) if r_data[2] & haen_bit]
+        mcp23s17log.info("Detected MCP23S17 devices at addresses %s", detected_devices)
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("No MCP23S17 device (no HAEN bit set) at addresses %s",
+                              [addr for addr in range(0, 8) if addr not in detected_devices])
 
         self._available_devices = detected_devices
+        self._open_key = None
 
-    def open_device(self, device_addr: int, register: Union[str, int], mode: int, bank: int = 0) -> None:
+    def _check_device(self, device_addr: int) -> None:
         """
-        Open communication with a specific MCP23S17 device by sending the control byte and register address.
-        if CE is low, it is pulled high first (auto close), then pulled low to start communication.
-        The device address is validated against detected devices.
-        The register can be specified by name (str) or address (int).
-        keeps CE low until close_device() is called.
+        Validate a device address against the range 0-7 and the detected devices.
 
-        :raises RuntimeError: if CE pin cannot be set correctly
         :raises ValueError: if the address is not detected or invalid
         :param device_addr: Device address (0-7)
-        :param register: Register name (str) or Register address (int). if str, BANK setting is used to determine address
-                         if int is provided, it is directly used as register address
-        :param mode: MCP23S17.READ (=1) for read, MCP23S17.WRITE (=0) for write
-        :param bank: BANK setting (0 or 1) to determine register addressing mode, default is 0
         """
-
         if 0 <= device_addr <= 7:
             if device_addr not in self._available_devices:
                 raise ValueError(f"Device address {device_addr} not detected. Available addresses: "
@@ -422,40 +556,435 @@ class MCP23S17:
         else:
             raise ValueError("Device address must be between 0 and 7.")
 
+    def _register_address(self, register: Union[str, int], bank: int = 0) -> int:
+        """
+        Resolve a register given by name (str), id (Reg) or address (int) to its register address.
+
+        :raises ValueError: if the register is neither a valid name nor a valid address
+        :param register: Register name (str), Register id (Reg) or Register address (int). if str or Reg, BANK
+                         setting is used to determine address, if int is provided, it is directly used as
+                         register address
+        :param bank: BANK setting (0 or 1) to determine register addressing mode, default is 0
+        :return: register address (0x00-0x1A)
+        """
         if isinstance(register, str):
-            reg_addr = MCP23S17.REGISTERS[register].address if bank == 0 else MCP23S17.REGISTERS[register].alt_address
+            try:
+                return _REG_ADDR[bank][register]
+            except KeyError:
+                raise ValueError(f"Unknown register name {register!r}.") from None
+        elif isinstance(register, Reg):
+            return _REG_TABLE[bank][register]
         elif isinstance(register, int):
-            reg_addr = register
-            if not (0x00 <= reg_addr <= 0x1A):
+            if not (0x00 <= register <= 0x1A):
                 raise ValueError("Register address must be between 0x00 and 0x1A.")
+            return register
         else:
             raise ValueError("Register must be a string (register name) or an integer (register address).")
 
-        self.close_device()   # sets CE high if it was low
+    def write_registers(self, device_addr: int, register: Union[str, int],
+                        data: Union[bytes, bytearray, int, Sequence[int]]) -> bytes:
+        """
+        Write data to one or more consecutive registers of a MCP23S17 device in a single SPI transfer.
+        Control byte, register address and payload are sent as one buffer, CS is asserted by the SPI controller
+        for the duration of the transfer.
+        Burst writes rely on the address pointer auto-increment, which requires IOCON.SEQOP=0 (default,
+        kept by detect_devices()). E.g. write_registers(0, 'IODIRA', [0x00, 0x0F, 0x00, 0x00]) writes
+        IODIRA, IODIRB, IPOLA and IPOLB in one transaction (BANK=0).
+
+        :raises ValueError: if the address is not detected or invalid, the register is invalid or data contains
+                            values outside 0..255
+        :param device_addr: Device address (0-7)
+        :param register: Register name (str) or Register address (int), resolved with the device's BANK setting
+        :param data: byte (int), bytes-like object (bytes, bytearray, memoryview) or sequence of ints to write,
+                     consecutive registers are written if IOCON.SEQOP=0
+        :return: bytes shifted out by the device during the payload
+        """
+        self._check_device(device_addr)
+        return self._write_transact(device_addr, self._register_address(register, self.bank[device_addr]), data)
 
-        self._gpios['ce'].write(False)  # Set CE low to start communication
-        if self._gpios['ce'].read():
-            raise RuntimeError("Failed to set CE pin low.")
+    def _write_transact(self, device_addr: int, reg_addr: int,
+                        data: Union[bytes, bytearray, int, Sequence[int]], speed_hz: int = 0) -> bytes:
+        """
+        Inner write transaction without device/register validation, for callers that validated already
+        (write_registers(), write contexts after open_device()).
+
+        :raises ValueError: if data contains values outside 0..255
+        :param device_addr: Device address (0-7), must be detected
+        :param reg_addr: Register address (0x00-0x1A)
+        :param data: byte (int), bytes-like object or sequence of ints to write
+        :param speed_hz: per-transfer SPI speed, 0 = SPI_SPEED_FAST for FAST_REGISTERS (if set), else SPI_SPEED
+        :return: bytes shifted out by the device during the payload
+        """
+        if isinstance(data, int):
+            data = (data,)
+        if not speed_hz and self._fast_hz:
+            speed_hz = self._frame_hz(device_addr, reg_addr)
+
+        n = 2 + len(data)
+        if n <= len(self._txbuf):
+            buf = self._txbuf  # preallocated, control byte + register address + payload are filled in place
+            buf[0] = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.WRITE]
+            buf[1] = reg_addr
+            try:
+                buf[2:n] = data  # range check of all bytes in C, no per-byte Python loop
+            except (ValueError, TypeError):
+                raise ValueError("data bytes must be integers 0..255") from None
+            r_data = bytes(self._xfer_hz(buf[:n], speed_hz)[2:])
+        else:
+            prefix = bytes((MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.WRITE], reg_addr))
+            r_data = self._xfer_message([prefix, MCP23S17._payload(data)], speed_hz)[1]
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("Wrote %s to MCP23S17 device at address %d, register 0x%02X",
+                              list(data), device_addr, reg_addr)
+        return r_data
+
+    @staticmethod
+    def _payload(data: Union[bytes, bytearray, int, Sequence[int]]) -> bytes:
+        """
+        Convert write data to bytes, an int is a single byte (not a length as for bytes(int)).
 
-        self._opened_device = device_addr
-        control_byte = MCP23S17.CONTROLBYTE(device_addr, mode)
+        :raises ValueError: if data contains values outside 0..255
+        :param data: byte (int), bytes-like object or sequence of ints
+        :return: payload bytes
+        """
+        if isinstance(data, int):
+            data = (data,)
+        try:
+            return bytes(data)
+        except (ValueError, TypeError):
+            raise ValueError("data bytes must be integers 0..255") from None
+
+    def read_registers(self, device_addr: int, register: Union[str, int], length: int = 1) -> bytes:
+        """
+        Read data from one or more consecutive registers of a MCP23S17 device in a single SPI transfer.
+        Burst reads rely on the address pointer auto-increment, which requires IOCON.SEQOP=0 (default,
+        kept by detect_devices()).
+        Control byte, register address and dummy bytes are sent as one buffer, CS is asserted by the SPI controller
+        for the duration of the transfer. The leading two response bytes (clocked out during control byte and
+        address) are dropped.
+
+        :raises ValueError: if the address is not detected or invalid, or the register is invalid
+        :param device_addr: Device address (0-7)
+        :param register: Register name (str) or Register address (int), resolved with the device's BANK setting
+        :param length: number of bytes to read, consecutive registers are read if IOCON.SEQOP=0
+        :return: bytes read from the device
+        """
+        self._check_device(device_addr)
+        return self._read_transact(device_addr, self._register_address(register, self.bank[device_addr]), length)
+
+    def _read_transact(self, device_addr: int, reg_addr: int, length: int, speed_hz: int = 0) -> bytes:
+        """
+        Inner read transaction without device/register validation, for callers that validated already
+        (read_registers(), read contexts after open_device()).
+
+        :param device_addr: Device address (0-7), must be detected
+        :param reg_addr: Register address (0x00-0x1A)
+        :param length: number of bytes to read
+        :param speed_hz: per-transfer SPI speed, 0 = SPI_SPEED_FAST for FAST_REGISTERS (if set), else SPI_SPEED
+        :return: bytes read from the device
+        """
+        if not speed_hz and self._fast_hz:
+            speed_hz = self._frame_hz(device_addr, reg_addr)
+        n = 2 + length
+        if n <= len(self._rxbuf):
+            buf = self._rxbuf  # preallocated, only control byte + register address are set, dummy bytes stay 0
+            buf[0] = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.READ]
+            buf[1] = reg_addr
+            r_data = bytes(self._xfer_hz(buf[:n], speed_hz)[2:])
+        else:
+            prefix = bytes((MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.READ], reg_addr))
+            r_data = self._xfer_message([prefix, bytes(length)], speed_hz)[1]  # send dummy bytes to read data
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("Read %s from MCP23S17 device at address %d, register 0x%02X",
+                              list(r_data), device_addr, reg_addr)
+        return r_data
+
+    def _xfer_message(self, parts: List[bytes], speed_hz: int = 0) -> List[bytes]:
+        """
+        Transfer several buffers as one SPI message. The parts are concatenated and sent with a single
+        spi.transfer() (one SPI_IOC_MESSAGE ioctl), CS stays asserted and the kernel clocks them out back-to-back
+        without userspace latency between e.g. control byte/register address and payload.
+
+        :param parts: buffers to send in order
+        :param speed_hz: per-transfer SPI speed, 0 = SPI_SPEED
+        :return: received bytes, split at the same positions as parts
+        """
+        r_data = self._xfer_hz(b''.join(parts), speed_hz)
+        result = []
+        pos = 0
+        for part in parts:
+            result.append(r_data[pos:pos + len(part)])
+            pos += len(part)
+        return result
+
+    def _frame_hz(self, device_addr: int, reg_addr: int) -> int:
+        """
+        Per-transfer SPI speed for a transfer starting at reg_addr of a device.
+
+        :return: SPI_SPEED_FAST for FAST_REGISTERS (if set), 0 (= SPI_SPEED) otherwise
+        """
+        if self._fast_hz and reg_addr in _FAST_ADDR[self.bank[device_addr]]:
+            return self._fast_hz
+        return 0
+
+    def _xfer_hz(self, buf: Union[bytes, bytearray], speed_hz: int) -> bytes:
+        """
+        Transfer one buffer, with speed_hz as per-transfer SPI speed in the same single ioctl (see _xfer_frames()),
+        speed_hz = 0 uses spi.transfer() at SPI_SPEED.
+        """
+        if speed_hz:
+            return self._xfer_frames([buf], speed_hz)[0]
+        return self._xfer(buf)
+
+    @staticmethod
+    def _register_pair(register: str, bank: int) -> tuple:
+        """
+        Resolve an A register name (e.g. 'GPIOA', 'IODIRA', 'OLATA') to the addresses of the A/B register pair.
+
+        :raises ValueError: if register is not the A register of an A/B pair
+        :return: (A register address, B register address) for the given BANK setting
+        """
+        if isinstance(register, Reg):
+            register = register.name
+        if not (isinstance(register, str) and register.endswith('A') and register[:-1] + 'B' in _REG_ADDR[bank]):
+            raise ValueError(f"Register {register} is not the A register of an A/B register pair.")
+        return _REG_ADDR[bank][register], _REG_ADDR[bank][register[:-1] + 'B']
+
+    def read16(self, device_addr: int, register: str) -> int:
+        """
+        Read an A/B register pair (e.g. GPIOA+GPIOB) of a MCP23S17 device as one 16 bit value with a single 4 byte
+        SPI transfer (control byte, A register address, 2 dummy bytes), the address pointer advances to the
+        B register (IOCON.SEQOP=0). With BANK=1 A and B are not adjacent, both are then read in one SPI message
+        of two frames.
+
+        :raises ValueError: if the address is not detected or invalid, or register is not an A register
+        :param device_addr: Device address (0-7)
+        :param register: name of the A register, e.g. 'GPIOA'
+        :return: B << 8 | A
+        """
+        self._check_device(device_addr)
+        reg_a, reg_b = self._register_pair(register, self.bank[device_addr])
+        ctl = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.READ]
+        if reg_b == reg_a + 1:
+            return int.from_bytes(self._read_transact(device_addr, reg_a, 2), 'little')  # preallocated buffer
+        r_a, r_b = self._xfer_frames([bytes((ctl, reg_a, 0x00)), bytes((ctl, reg_b, 0x00))],
+                                     [self._frame_hz(device_addr, reg_a), self._frame_hz(device_addr, reg_b)])
+        return r_b[2] << 8 | r_a[2]
+
+    def write16(self, device_addr: int, register: str, value: int) -> None:
+        """
+        Write an A/B register pair (e.g. OLATA+OLATB) of a MCP23S17 device from one 16 bit value with a single
+        4 byte SPI transfer (control byte, A register address, A, B), the address pointer advances to the
+        B register (IOCON.SEQOP=0). With BANK=1 A and B are not adjacent, both are then written in one SPI message
+        of two frames.
+
+        :raises ValueError: if the address is not detected or invalid, register is not an A register
+                            or value is not 0..0xFFFF
+        :param device_addr: Device address (0-7)
+        :param register: name of the A register, e.g. 'OLATA'
+        :param value: B << 8 | A
+        """
+        self._check_device(device_addr)
+        reg_a, reg_b = self._register_pair(register, self.bank[device_addr])
+        ctl = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.WRITE]
+        try:
+            word = value.to_bytes(2, 'little')
+        except OverflowError:
+            raise ValueError("value must be between 0x0000 and 0xFFFF.") from None
+        if reg_b == reg_a + 1:
+            self._write_transact(device_addr, reg_a, word)  # preallocated buffer
+        else:
+            self._xfer_frames([bytes((ctl, reg_a, word[0])), bytes((ctl, reg_b, word[1]))],
+                              [self._frame_hz(device_addr, reg_a), self._frame_hz(device_addr, reg_b)])
+
+    def read_gpio16(self, device_addr: int) -> int:
+        """
+        Read GPIOA and GPIOB of a MCP23S17 device as one 16 bit value, see read16().
+
+        :raises ValueError: if the address is not detected or invalid
+        :param device_addr: Device address (0-7)
+        :return: GPIOB << 8 | GPIOA
+        """
+        return self.read16(device_addr, 'GPIOA')
+
+    def write_gpio16(self, device_addr: int, value: int) -> None:
+        """
+        Write GPIOA and GPIOB of a MCP23S17 device from one 16 bit value, see write16().
+
+        :raises ValueError: if the address is not detected or invalid, or value is not 0..0xFFFF
+        :param device_addr: Device address (0-7)
+        :param value: GPIOB << 8 | GPIOA
+        """
+        self.write16(device_addr, 'GPIOA', value)
+
+    def write_many(self, device_addr: int, register: Union[str, int],
+                   data: Union[bytes, bytearray, int, Sequence[int]]) -> None:
+        """
+        Stream many bytes into the same register (pair) of a MCP23S17 device with one long SPI transaction,
+        e.g. output patterns on OLATA/OLATB at SPI clock rate. The address pointer does not advance in byte mode
+        (IOCON.SEQOP=1): with BANK=1 all bytes go to register, with BANK=0 the pointer toggles between the A/B
+        pair, so data is A, B, A, B, ... when starting at an A register.
+        IOCON is read once, then SEQOP=1, the stream and the IOCON restore are sent as one SPI message of three
+        frames (see _xfer_frames()). Long transfers are done by DMA on spi-bcm2835 (from 96 bytes), the whole
+        message must fit into the spidev buffer (module parameter spidev.bufsiz, default 4096 bytes).
+        For writing consecutive registers use write_registers().
+
+        :raises ValueError: if the address is not detected or invalid, the register is invalid or data contains
+                            values outside 0..255
+        :param device_addr: Device address (0-7)
+        :param register: Register name (str) or Register address (int), resolved with the device's BANK setting
+        :param data: byte (int), bytes-like object or sequence of ints to write
+        """
+        self._check_device(device_addr)
+        bank = self.bank[device_addr]
+        reg_addr = self._register_address(register, bank)
+        payload = MCP23S17._payload(data)
+
+        iocon_addr = _REG_ADDR[bank]['IOCON']
+        iocon = self._read_transact(device_addr, iocon_addr, 1)[0]
+        seqop_bit = MCP23S17.REGISTERS['IOCON']('SEQOP')
+        ctl = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.WRITE]
+        self._xfer_frames([bytes((ctl, iocon_addr, iocon | seqop_bit)),
+                           bytes((ctl, reg_addr)) + payload,
+                           bytes((ctl, iocon_addr, iocon))],
+                          [0, self._frame_hz(device_addr, reg_addr), 0])  # stream at SPI_SPEED_FAST (if set)
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("Streamed %d bytes to MCP23S17 device at address %d, register 0x%02X",
+                              len(payload), device_addr, reg_addr)
+
+    def wait_interrupt(self, device_addr: int, pin: str = 'inta', timeout: Union[int, float, None] = None):
+        """
+        Wait for an interrupt of a MCP23S17 device on its INTA or INTB pin and fetch cause and captured port values.
+        The pin is requested with falling edge detection, the wait blocks in the kernel (GPIO.poll()) instead of
+        sampling the pin. After an edge INTFA, INTFB, INTCAPA and INTCAPB are read in a single 4 byte
+        SPI transfer (BANK=0, IOCON.SEQOP=0), with BANK=1 in one SPI message of two frames. Reading INTCAP
+        clears the interrupt of both ports.
+        Interrupts have to be enabled by the caller before (GPINTENA/B, DEFVALA/B, INTCONA/B).
+        Usage:
+            result = mcp.wait_interrupt(0, 'inta', timeout=1.0)
+            if result is not None:
+                flags, captured = result
 
-        self.spi.transfer([control_byte, reg_addr])
+        :raises ValueError: if the address is not detected or invalid, or pin is not 'inta' or 'intb'
+        :raises RuntimeError: if the pin is not configured in MCP settings
+        :param device_addr: Device address (0-7)
+        :param pin: 'inta' or 'intb'
+        :param timeout: seconds to wait, None waits forever
+        :return: (INTFB << 8 | INTFA, INTCAPB << 8 | INTCAPA), None on timeout
+        """
+        self._check_device(device_addr)
+        if pin not in ('inta', 'intb'):
+            raise ValueError("pin must be 'inta' or 'intb'.")
+        gpio = self._inta_gpio if pin == 'inta' else self._intb_gpio
+        if gpio is None:
+            raise RuntimeError(f"{pin.upper()} pin not configured in MCP settings.")
+
+        if not gpio.poll(timeout):
+            return None
+        gpio.read_event()  # consume the edge event
+
+        bank = self.bank[device_addr]
+        if bank == 0:
+            # INTFA, INTFB, INTCAPA, INTCAPB are consecutive registers
+            r_data = self._read_transact(device_addr, _REG_ADDR[0]['INTFA'], 4)
+            flags, captured = r_data[1] << 8 | r_data[0], r_data[3] << 8 | r_data[2]
+        else:
+            # INTFx, INTCAPx are consecutive per port
+            ctl = MCP23S17.CONTROL_BYTES[device_addr * 2 + MCP23S17.READ]
+            r_a, r_b = self._xfer_frames([bytes((ctl, _REG_ADDR[1]['INTFA'], 0x00, 0x00)),
+                                          bytes((ctl, _REG_ADDR[1]['INTFB'], 0x00, 0x00))])
+            flags, captured = r_b[2] << 8 | r_a[2], r_b[3] << 8 | r_a[3]
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("Interrupt on %s of MCP23S17 device at address %d: INTF=0x%04X, INTCAP=0x%04X",
+                              pin.upper(), device_addr, flags, captured)
+        return flags, captured
+
+    def transact_many(self, ops: Sequence[tuple]) -> List[bytes]:
+        """
+        Execute several register transactions, possibly on different devices, as one SPI message
+        (single SPI_IOC_MESSAGE(n) ioctl, CS toggled between transactions) instead of one syscall per transaction.
+        Usage:
+            gpioa, _ = mcp.transact_many([(0, 'GPIOA', MCP23S17.READ, 1), (1, 'OLATA', MCP23S17.WRITE, [0xFF])])
+
+        :raises ValueError: if an address is not detected or invalid, a register or mode is invalid or data contains
+                            values outside 0..255
+        :param ops: (device_addr, register, mode, data) tuples, data is the number of bytes to read for
+                    MCP23S17.READ or the byte (int) / bytes to write for MCP23S17.WRITE
+        :return: per transaction the bytes read (READ) or shifted out by the device during the payload (WRITE)
+        """
+        frames = []
+        speeds = []
+        for device_addr, register, mode, data in ops:
+            if mode not in (MCP23S17.READ, MCP23S17.WRITE):
+                raise ValueError("mode must be MCP23S17.READ or MCP23S17.WRITE.")
+            self._check_device(device_addr)
+            reg_addr = self._register_address(register, self.bank[device_addr])
+            if mode == MCP23S17.WRITE:
+                payload = MCP23S17._payload(data)
+            else:
+                try:
+                    payload = bytes(int(data))  # dummy bytes to read data
+                except (ValueError, TypeError):
+                    raise ValueError("read length must be a non-negative integer") from None
+            frames.append(bytes((MCP23S17.CONTROL_BYTES[device_addr * 2 + mode], reg_addr)) + payload)
+            speeds.append(self._frame_hz(device_addr, reg_addr))
+        return [r_data[2:] for r_data in self._xfer_frames(frames, speeds)]
+
+    def _xfer_frames(self, frames: List[bytes], speed_hz: Union[int, Sequence[int]] = 0) -> List[bytes]:
+        """
+        Transfer several frames as separate transactions (CS deasserted between frames) with a single
+        SPI_IOC_MESSAGE(n) ioctl on the spidev device. The simulation falls back to one transfer per frame
+        and ignores the speed.
+
+        :param frames: complete frames (control byte, register address, payload) to send in order
+        :param speed_hz: per-transfer SPI speed for all frames or one per frame, 0 = SPI_SPEED
+        :return: received bytes per frame, including the two bytes clocked out during control byte and address
+        """
+        if RPIPLATFORM:
+            return spi_message.transfer_frames(self.spi.fd, frames, speed_hz)
+        xfer = self._xfer
+        return [xfer(frame) for frame in frames]
+
+    def open_device(self, device_addr: int, register: Union[str, int], mode: int, bank: int = 0) -> None:
+        """
+        Open communication with a specific MCP23S17 device for subsequent transfers in the given mode.
+        No SPI traffic is generated, control byte and register address are sent with each transfer and CS is
+        asserted by the SPI controller (device tree CS pin) for the duration of each transfer.
+        The device address is validated against detected devices.
+        The register can be specified by name (str) or address (int).
+
+        :raises ValueError: if the address is not detected or invalid
+        :param device_addr: Device address (0-7)
+        :param register: Register name (str) or Register address (int). if str, BANK setting is used to determine address
+                         if int is provided, it is directly used as register address
+        :param mode: MCP23S17.READ (=1) for read, MCP23S17.WRITE (=0) for write
+        :param bank: BANK setting (0 or 1) to determine register addressing mode, default is 0
+        """
+        open_key = (device_addr, register, mode, bank)
+        if open_key == self._open_key:
+            # same device, register and mode as the last open, already validated
+            self._opened_device = device_addr
+            self._mode = mode
+            return
+
+        self._check_device(device_addr)
+        reg_addr = self._register_address(register, bank)
+
+        self._opened_device = device_addr
         self._mode = mode
+        self._open_key = open_key
 
-        mcp23s17log.debug(f"Opened communication with MCP23S17 device at address {device_addr}, "
-                          f"register {register} (0x{reg_addr:02X}), "
-                          f"mode {'READ' if mode == self.READ else 'WRITE'}")
+        if mcp23s17log.isEnabledFor(logging.DEBUG):
+            mcp23s17log.debug("Opened communication with MCP23S17 device at address %d, register %s (0x%02X), mode %s",
+                              device_addr, register, reg_addr, 'READ' if mode == self.READ else 'WRITE')
 
     def close_device(self) -> None:
         """
-        Close communication with the currently opened MCP23S17 device by pulling CE high.
+        Close communication with the currently opened MCP23S17 device.
         """
         if self._opened_device != -1:
-            self._gpios['ce'].write(True)  # Set CE high to end communication
-            if not self._gpios['ce'].read():
-                raise RuntimeError("Failed to set CE pin high.")
-            mcp23s17log.debug(f"Closed communication with MCP23S17 device at address {self._opened_device}")
+            if mcp23s17log.isEnabledFor(logging.DEBUG):
+                mcp23s17log.debug("Closed communication with MCP23S17 device at address %d", self._opened_device)
             self._opened_device = -1  # No device is currently opened
 
     def set_bank(self, device_addr: int, bank: int) -> None:
@@ -475,25 +1004,26 @@ class MCP23S17:
 
         current_bank = self.bank[device_addr]
         if current_bank == bank:
-            mcp23s17log.debug(f"BANK already set to {bank} for device at address {device_addr}, no change needed.")
+            mcp23s17log.debug("BANK already set to %d for device at address %d, no change needed.", bank, device_addr)
             return  # No change needed
 
-        with self.read(device_addr=device_addr, register='IOCON') as read_dev:
-            if dev.available:
-                current_iocon = read_dev(1)[0]  # Read current IOCON value
-            else:
-                current_iocon = 0x00  # Default if device not available
+        current_iocon = self.read_registers(device_addr, 'IOCON', 1)[0]  # Read current IOCON value
 
         if bank == 1:
             new_iocon = current_iocon | MCP23S17.REGISTERS['IOCON']('BANK')  # Set BANK bit
         else:
             new_iocon = current_iocon & ~MCP23S17.REGISTERS['IOCON']('BANK')  # Clear BANK bit
 
-        with self.write(device_addr=device_addr, register='IOCON') as write_dev:
-            write_dev([new_iocon])  # Write new IOCON value
+        self.write_registers(device_addr, 'IOCON', [new_iocon])  # Write new IOCON value
 
         self.bank[device_addr] = bank  # Update internal bank setting
-        mcp23s17log.info(f"Set BANK={bank} for MCP23S17 device at address {device_addr}")
+        self._open_key = None
+        mcp23s17log.info("Set BANK=%d for MCP23S17 device at address %d", bank, device_addr)
+
+
+# all 16 control bytes (8 device addresses x WRITE/READ), indexed by [device address * 2 + mode]
+MCP23S17.CONTROL_BYTES = tuple(MCP23S17.CONTROLBYTE(addr, rw) for addr in range(0, 8)
+                               for rw in (MCP23S17.WRITE, MCP23S17.READ))
 
 
 if __name__ == "__main__":
@@ -502,15 +1032,11 @@ if __name__ == "__main__":
 
     print("Available devices:", mcp.available_devices)
 
-    with mcp.write(device_addr=2, register='IODIRA') as wdev:
-        wdev([0x00])  # IODIRA: all output
-        wdev([0x0F])  # IODIRB: 0-3 input 4-7 output
-        wdev([0x00])  # IPOLA: no polarity inversion
-        wdev([0x00])  # IPOLB: no polarity inversion
+    # IODIRA: all output, IODIRB: 0-3 input 4-7 output, IPOLA/IPOLB: no polarity inversion
+    mcp.write_registers(device_addr=2, register='IODIRA', data=[0x00, 0x0F, 0x00, 0x00])
 
-    with mcp.read(device_addr=2, register='IODIRA') as rdev:
-        data = rdev(2)  # read IODIRA and IODIRB
-        print(f"IODIRA: 0x{data[0]:02X}, IODIRB: 0x{data[1]:02X}")
+    data = mcp.read_registers(device_addr=2, register='IODIRA', length=2)  # read IODIRA and IODIRB
+    print(f"IODIRA: 0x{data[0]:02X}, IODIRB: 0x{data[1]:02X}")
 
     while True:
         try:
@@ -1,8 +1,8 @@
-from typing import List
+from typing import Sequence
 
 
 class Register:
-    def __init__(self, address: int, bit_map: List, alt_address: int = None, use_alt_address: bool = False):
+    def __init__(self, address: int, bit_map: Sequence[str], alt_address: int = None, use_alt_address: bool = False):
         # alt_address: optional alternative address for the same register (e.g. for read vs write)
         # address: register address (e.g. integer)
         # bit_map: list of bit names in order of position, leftmost is MSB, e.g. ['BIT3', 'BIT2', 'BIT1', 'BIT0']
@@ -11,15 +11,17 @@ class Register:
         self.alt_address = alt_address    # optional alternative address for the same register (e.g. for read vs write)
         self.bit_map = bit_map            # dict: bit name -> position
         self.use_alt_address = use_alt_address      # flag to indicate whether to use alt_address
+        # bit name -> mask, computed once so __call__ only touches the requested bits
+        nbits = len(bit_map)
+        self._mask = {bit: 1 << (nbits - 1 - pos) for pos, bit in enumerate(bit_map) if bit is not None}
 
     def __call__(self, *bits):
         # register instance called with bit names, returns integer value with those bits set
-        pos = len(self.bit_map)  # start from MSB position
+        # unknown bit names are ignored
+        mask = self._mask
         value = 0
-        for bit in self.bit_map:
-            if bit in bits:
-                value |= (1 << (pos - 1))
-            pos -= 1
+        for bit in bits:
+            value |= mask.get(bit, 0)
 
         return value
 
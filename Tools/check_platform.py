@@ -1,27 +1,51 @@
+import functools
+import os
 import platform
+import re
 import sys
 
+__all__ = ['PLATFORM', 'IS_RPI', 'IS_WIN', 'get_platform', 'is_raspberry_pi', 'is_windows', 'is_linux']
 
+# sys.platform is fixed when the interpreter is built, 'win32' for all Windows and 'linux' for all Linux builds
+_IS_WINDOWS = sys.platform.startswith('win')
+_IS_LINUX = sys.platform.startswith('linux')
+
+# 'Hardware : BCM2835' line of /proc/cpuinfo
+_CPUINFO_BCM = re.compile(rb'^Hardware\s*:.*BCM', re.MULTILINE)
+
+
+def _read_head(path, size):
+    # at most size bytes with a single read(2) on a raw fd, no buffered file object
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
 def is_raspberry_pi():
+    # probes hostname, device tree and cpuinfo once, the result is cached for the process
+    # /proc probes only make sense on Linux, skip them elsewhere
+    if not is_linux():
+        return False
+
     # Check for 'raspberrypi' in the platform string
     if 'raspberrypi' in platform.uname().node.lower():
         return True
 
     # Try to read /proc/device-tree/model
     try:
-        with open('/proc/device-tree/model') as f:
-            if 'Raspberry Pi' in f.read():
-                return True
-    except Exception:
+        if _read_head('/proc/device-tree/model', 64).startswith(b'Raspberry Pi'):  # e.g. 'Raspberry Pi 4 Model B'
+            return True
+    except OSError:
         pass
 
-    # Check for BCM in cpuinfo
+    # Check for BCM in cpuinfo, one read instead of a line loop (the Hardware line is within the first 4K)
     try:
-        with open('/proc/cpuinfo') as f:
-            for line in f:
-                if line.startswith('Hardware') and 'BCM' in line:
-                    return True
-    except Exception:
+        if _CPUINFO_BCM.search(_read_head('/proc/cpuinfo', 4096)):
+            return True
+    except OSError:
         pass
 
     return False
@@ -29,14 +53,15 @@ def is_raspberry_pi():
 
 def is_windows():
     # Checks if the platform is Windows
-    return sys.platform.startswith('win') or platform.system() == 'Windows'
+    return _IS_WINDOWS
 
 
 def is_linux():
     # Checks if the platform is Linux
-    return sys.platform.startswith('linux') or platform.system() == 'Linux'
+    return _IS_LINUX
 
 
+@functools.lru_cache(maxsize=1)
 def get_platform():
     if is_windows():
         return 'Windows'
@@ -49,6 +74,21 @@ def get_platform():
         return 'Unknown'
 
 
+def __getattr__(name):
+    # PLATFORM, IS_RPI and IS_WIN are module constants, computed on first access only (no /proc probes at import)
+    # and stored as module globals, later accesses don't reach __getattr__
+    if name == 'PLATFORM':
+        value = get_platform()
+    elif name == 'IS_RPI':
+        value = get_platform() == 'Raspberry Pi'
+    elif name == 'IS_WIN':
+        value = get_platform() == 'Windows'
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
 if __name__ == "__main__":
     platform_name = get_platform()
     print(f"Detected platform: {platform_name}")
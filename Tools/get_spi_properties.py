@@ -1,6 +1,9 @@
 import os
 import struct
 
+# one cs-gpios entry: phandle, flags << 8 | gpio number (big endian u32 cells)
+_CS_STRUCT = struct.Struct(">II")
+
 SPI_NODE_TO_BUS = {
     "spi@7e204000": "SPI0",
     "spi@7e215080": "SPI1",
@@ -12,35 +15,39 @@ def read_device_tree_spi_cs():
     soc_path = os.path.join(dt_base, "soc")
     result = {}
 
-    if not os.path.exists(soc_path):
-        raise RuntimeError("Device tree not found. Are you running on a Raspberry Pi?")
+    try:
+        soc_fd = os.open(soc_path, os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        raise RuntimeError("Device tree not found. Are you running on a Raspberry Pi?") from None
 
-    for entry in os.listdir(soc_path):
-        if entry.startswith("spi@"):
-            spi_path = os.path.join(soc_path, entry)
-            cs_gpios_file = os.path.join(spi_path, "cs-gpios")
-            cs_list = []
-            if os.path.exists(cs_gpios_file):
-                try:
-                    with open(cs_gpios_file, "rb") as f:
-                        data = f.read()
-                        for i in range(0, len(data), 8):
-                            gpio_data = data[i:i+8]
-                            if len(gpio_data) < 8:
-                                continue
-                            phandle, flags_and_number = struct.unpack(">II", gpio_data)
-                            gpio_number = flags_and_number & 0xff
-                            flags = (flags_and_number >> 8)
-                            cs_list.append({
-                                "gpio_number": gpio_number,
-                                "flags": flags,
-                                "phandle": phandle
-                            })
-                except Exception as e:
-                    cs_list.append({"error": str(e)})
-            else:
-                cs_list.append({"info": "No cs-gpios property found. Default CS pins may apply (CE0/CE1)."})
-            result[SPI_NODE_TO_BUS.get(entry, entry)] = cs_list  # Use bus name if known, otherwise raw node
+    # soc is resolved once, SPI nodes are listed and their cs-gpios opened relative to soc_fd (openat)
+    # scandir yields the names without a separate stat, cs-gpios is opened directly instead of checked first
+    try:
+        with os.scandir(soc_fd) as entries:
+            for entry in entries:
+                if entry.name.startswith("spi@"):
+                    cs_list = []
+                    try:
+                        with os.fdopen(os.open(f"{entry.name}/cs-gpios", os.O_RDONLY, dir_fd=soc_fd), "rb") as f:
+                            data = f.read()
+                            n = len(data) - len(data) % _CS_STRUCT.size  # ignore a truncated trailing entry
+                            # memoryview: the cut to whole entries is zero-copy
+                            for phandle, flags_and_number in _CS_STRUCT.iter_unpack(memoryview(data)[:n]):
+                                gpio_number = flags_and_number & 0xff
+                                flags = (flags_and_number >> 8)
+                                cs_list.append({
+                                    "gpio_number": gpio_number,
+                                    "flags": flags,
+                                    "phandle": phandle
+                                })
+                    except (FileNotFoundError, NotADirectoryError):
+                        cs_list.append({"info": "No cs-gpios property found. Default CS pins may apply (CE0/CE1)."})
+                    except Exception as e:
+                        cs_list.append({"error": str(e)})
+                    # Use bus name if known, otherwise raw node
+                    result[SPI_NODE_TO_BUS.get(entry.name, entry.name)] = cs_list
+    finally:
+        os.close(soc_fd)
 
     return result
 
@@ -1,14 +1,39 @@
+import collections
+import os
+import time
+
+# [SIM] messages are only printed with RPI_SIM_DEBUG set (e.g. RPI_SIM_DEBUG=1), formatted on output only
+_DEBUG = bool(os.environ.get("RPI_SIM_DEBUG"))
+
+
+def _log(msg, *args):
+    if _DEBUG:
+        print(msg % args)
+
+
 class GPIO:
+    # fixed set of instance attributes, no per-instance __dict__
+    __slots__ = ('path', 'pin', 'edge', '_direction', '_value', '_closed')
+
     DIRECTION_IN = "in"
     DIRECTION_OUT = "out"
+    _DIRECTIONS = (DIRECTION_IN, DIRECTION_OUT)  # valid values of the direction setter
+
+    # like periphery.EdgeEvent
+    EdgeEvent = collections.namedtuple('EdgeEvent', ['edge', 'timestamp'])
 
-    def __init__(self, path, line, direction, initial=None):
+    def __init__(self, path, line, direction, initial=None, edge="none"):
         self.path = path
         self.pin = line
+        self.edge = edge
+        # like periphery, "high"/"low" request an output with that initial value
+        if direction in ("high", "low"):
+            initial = 1 if direction == "high" else 0
+            direction = self.DIRECTION_OUT
         self._direction = direction
         self._value = initial if initial is not None else 0
         self._closed = False
-        print(f"[SIM] GPIO(pin={line}, direction={direction}, initial={self._value})")
+        _log("[SIM] GPIO(pin=%s, direction=%s, initial=%s)", line, direction, self._value)
 
     @property
     def direction(self):
@@ -16,31 +41,50 @@ class GPIO:
 
     @direction.setter
     def direction(self, value):
-        if value not in [self.DIRECTION_IN, self.DIRECTION_OUT]:
+        if value not in self._DIRECTIONS:
             raise ValueError("Invalid direction. Must be 'in' or 'out'.")
         self._direction = value
-        print(f"[SIM] GPIO {self.pin} direction set to {value}")
+        _log("[SIM] GPIO %s direction set to %s", self.pin, value)
 
     def read(self):
-        print(f"[SIM] GPIO {self.pin} read -> {self._value}")
+        _log("[SIM] GPIO %s read -> %s", self.pin, self._value)
         return self._value
 
     def write(self, value):
         if self._direction != self.DIRECTION_OUT:
             raise RuntimeError("Cannot write to input GPIO")
-        self._value = int(bool(value))
-        print(f"[SIM] GPIO {self.pin} write <- {self._value}")
+        self._value = 1 if value else 0
+        _log("[SIM] GPIO %s write <- %s", self.pin, self._value)
+
+    def poll(self, timeout=None):
+        # no edges occur in the simulation, waits for the timeout (None returns immediately) and reports no event
+        _log("[SIM] GPIO %s poll (edge=%s, timeout=%s) -> False", self.pin, self.edge, timeout)
+        if timeout:
+            time.sleep(timeout)
+        return False
+
+    def read_event(self):
+        _log("[SIM] GPIO %s read_event", self.pin)
+        return self.EdgeEvent(self.edge, time.monotonic_ns())
 
     def close(self):
         self._closed = True
-        print(f"[SIM] GPIO {self.pin} closed")
+        _log("[SIM] GPIO %s closed", self.pin)
+
+    # scoped lifetime via with, like periphery, no __del__ finalizer
+    def __enter__(self):
+        return self
 
-    def __del__(self):
-        if not self._closed:
-            self.close()
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 class SPI:
+    # fixed set of instance attributes, no per-instance __dict__
+    __slots__ = ('devpath', '_mode', '_max_speed', '_bit_order', '_bits_per_word', '_closed')
+
+    _BIT_ORDERS = ("msb", "lsb")  # valid values of the bit_order setter
+
     def __init__(self, devpath, mode=0, max_speed=500000, bit_order="msb", bits_per_word=8):
         self.devpath = devpath
         self._mode = mode
@@ -48,7 +92,8 @@ class SPI:
         self._bit_order = bit_order
         self._bits_per_word = bits_per_word
         self._closed = False
-        print(f"[SIM] SPI(devpath={devpath}, mode={mode}, max_speed={max_speed}, bit_order={bit_order}, bits_per_word={bits_per_word})")
+        _log("[SIM] SPI(devpath=%s, mode=%s, max_speed=%s, bit_order=%s, bits_per_word=%s)",
+             devpath, mode, max_speed, bit_order, bits_per_word)
 
     @property
     def mode(self):
@@ -57,7 +102,7 @@ class SPI:
     @mode.setter
     def mode(self, value):
         self._mode = value
-        print(f"[SIM] SPI {self.devpath} mode set to {value}")
+        _log("[SIM] SPI %s mode set to %s", self.devpath, value)
 
     @property
     def max_speed(self):
@@ -66,7 +111,7 @@ class SPI:
     @max_speed.setter
     def max_speed(self, value):
         self._max_speed = value
-        print(f"[SIM] SPI {self.devpath} max_speed set to {value}")
+        _log("[SIM] SPI %s max_speed set to %s", self.devpath, value)
 
     @property
     def bit_order(self):
@@ -74,10 +119,10 @@ class SPI:
 
     @bit_order.setter
     def bit_order(self, value):
-        if value not in ["msb", "lsb"]:
+        if value not in self._BIT_ORDERS:
             raise ValueError("bit_order must be 'msb' or 'lsb'")
         self._bit_order = value
-        print(f"[SIM] SPI {self.devpath} bit_order set to {value}")
+        _log("[SIM] SPI %s bit_order set to %s", self.devpath, value)
 
     @property
     def bits_per_word(self):
@@ -85,46 +130,48 @@ class SPI:
 
     @bits_per_word.setter
     def bits_per_word(self, value):
-        if not isinstance(value, int) or not (1 <= value <= 32):
+        if not (type(value) is int and 1 <= value <= 32):  # exact int, bool is rejected
             raise ValueError("bits_per_word must be an integer between 1 and 32")
         self._bits_per_word = value
-        print(f"[SIM] SPI {self.devpath} bits_per_word set to {value}")
+        _log("[SIM] SPI %s bits_per_word set to %s", self.devpath, value)
 
     def transfer(self, data):
-        # Simulate full-duplex transfer: echo the data
-        print(f"[SIM] SPI {self.devpath} transfer: {data}")
-        return data.copy()
+        # Simulate full-duplex transfer: echo the data, same type as shifted in data (like periphery)
+        if _DEBUG:  # checked inline, no _log() call per transfer with debug output off
+            _log("[SIM] SPI %s transfer: %s", self.devpath, data)
+        return type(data)(data)
 
     def read(self, length):
         # Return zeros as dummy data
-        dummy = bytearray([0]*length)
-        print(f"[SIM] SPI {self.devpath} read {length} bytes -> {dummy}")
+        dummy = bytearray(length)  # zero filled in C
+        _log("[SIM] SPI %s read %s bytes -> %s", self.devpath, length, dummy)
         return dummy
 
     def write(self, data):
-        print(f"[SIM] SPI {self.devpath} write: {data}")
+        _log("[SIM] SPI %s write: %s", self.devpath, data)
 
     def close(self):
         self._closed = True
-        print(f"[SIM] SPI {self.devpath} closed")
+        _log("[SIM] SPI %s closed", self.devpath)
+
+    # scoped lifetime via with, like periphery, no __del__ finalizer
+    def __enter__(self):
+        return self
 
-    def __del__(self):
-        if not self._closed:
-            self.close()
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 # Example usage
 if __name__ == "__main__":
-    spi = SPI("/dev/spidev0.0", mode=1, max_speed=1000000, bits_per_word=8)
-    spi.write(b'\x01\x02\x03')
-    data = spi.read(3)
-    result = spi.transfer(b'\x04\x05\x06')
-    spi.max_speed = 500000
-    spi.bit_order = "lsb"
-    spi.close()
-
-    gpio = GPIO(17, GPIO.DIRECTION_OUT, initial=1)
-    print(gpio.read())
-    gpio.write(0)
-    gpio.direction = GPIO.DIRECTION_IN
-    gpio.close()
\ No newline at end of file
+    with SPI("/dev/spidev0.0", mode=1, max_speed=1000000, bits_per_word=8) as spi:
+        spi.write(b'\x01\x02\x03')
+        data = spi.read(3)
+        result = spi.transfer(b'\x04\x05\x06')
+        spi.max_speed = 500000
+        spi.bit_order = "lsb"
+
+    with GPIO("/dev/gpiochip0", 17, GPIO.DIRECTION_OUT, initial=1) as gpio:
+        print(gpio.read())
+        gpio.write(0)
+        gpio.direction = GPIO.DIRECTION_IN
@@ -0,0 +1,63 @@
+import ctypes
+import fcntl
+
+SPI_IOC_MAGIC = ord('k')
+
+
+class spi_ioc_transfer(ctypes.Structure):
+    # struct spi_ioc_transfer from linux/spi/spidev.h
+    _fields_ = [
+        ("tx_buf", ctypes.c_uint64),
+        ("rx_buf", ctypes.c_uint64),
+        ("len", ctypes.c_uint32),
+        ("speed_hz", ctypes.c_uint32),
+        ("delay_usecs", ctypes.c_uint16),
+        ("bits_per_word", ctypes.c_uint8),
+        ("cs_change", ctypes.c_uint8),
+        ("tx_nbits", ctypes.c_uint8),
+        ("rx_nbits", ctypes.c_uint8),
+        ("word_delay_usecs", ctypes.c_uint8),
+        ("pad", ctypes.c_uint8),
+    ]
+
+
+def SPI_IOC_MESSAGE(n):
+    # _IOW(SPI_IOC_MAGIC, 0, char[n * sizeof(struct spi_ioc_transfer)])
+    return (1 << 30) | ((n * ctypes.sizeof(spi_ioc_transfer)) << 16) | (SPI_IOC_MAGIC << 8)
+
+
+def transfer_frames(fd, frames, speed_hz=0, bits_per_word=0):
+    # Full-duplex transfer of several frames with a single SPI_IOC_MESSAGE(n) ioctl.
+    # CS is deasserted between frames (cs_change=1), so each frame is a separate transaction for the slave.
+    # speed_hz/bits_per_word = 0 use the device settings, speed_hz can also be a sequence with one speed per frame.
+    # Returns the received bytes per frame.
+    n = len(frames)
+    speeds = speed_hz if isinstance(speed_hz, (list, tuple)) else (speed_hz,) * n
+    xfers = (spi_ioc_transfer * n)()
+    tx_bufs = []
+    rx_bufs = []
+    for i, frame in enumerate(frames):
+        frame = bytes(frame)
+        tx = ctypes.create_string_buffer(frame, len(frame))
+        rx = ctypes.create_string_buffer(len(frame))
+        tx_bufs.append(tx)  # keep buffers alive until the ioctl returns
+        rx_bufs.append(rx)
+        xfers[i].tx_buf = ctypes.addressof(tx)
+        xfers[i].rx_buf = ctypes.addressof(rx)
+        xfers[i].len = len(frame)
+        xfers[i].speed_hz = speeds[i]
+        xfers[i].bits_per_word = bits_per_word
+        xfers[i].cs_change = 1 if i < n - 1 else 0  # toggle CS between frames, release after the last one
+
+    fcntl.ioctl(fd, SPI_IOC_MESSAGE(n), xfers)
+    return [rx.raw for rx in rx_bufs]
+
+
+# Example usage:
+if __name__ == "__main__":
+    import os
+    spi_fd = os.open("/dev/spidev0.0", os.O_RDWR)
+    try:
+        print(transfer_frames(spi_fd, [b'\x41\x0a\x00', b'\x43\x0a\x00']))
+    finally:
+        os.close(spi_fd)